@@ -9,10 +9,13 @@ Author: AIAR Guitar Team
 
 import os
 import time
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import ValidationError
@@ -23,8 +26,15 @@ from app.models.inference_models import (
     InferenceError,
     HealthResponse,
     QdrantHealthResponse,
+    result_to_dict,
+)
+from app.services.chord_recognition import ChordRecognitionService, VECTOR_SIZE
+from app.services.binary_protocol import (
+    MAX_BATCH_SIZE,
+    decode_request,
+    encode_message,
+    encode_batch,
 )
-from app.services.chord_recognition import ChordRecognitionService
 
 # ==============================================
 # Configuration
@@ -35,6 +45,15 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# WebSocket subprotocols, in order of server preference
+BINARY_FRAME_SUBPROTOCOL = "aiar.frame.v1"  # Fixed-layout binary frames
+JSON_BINARY_SUBPROTOCOL = "aiar.json.binary"  # JSON carried in binary frames
+SUPPORTED_SUBPROTOCOLS = (BINARY_FRAME_SUBPROTOCOL, JSON_BINARY_SUBPROTOCOL)
+
+# Pending messages per connection; the oldest is dropped when full
+INBOUND_QUEUE_SIZE = 4
+OUTBOUND_QUEUE_SIZE = 64
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
@@ -141,83 +160,242 @@ async def qdrant_health_check():
 # WebSocket Endpoint
 # ==============================================
 
-@app.websocket("/ws/inference")
-async def websocket_inference(websocket: WebSocket):
+def _select_subprotocol(websocket: WebSocket) -> Optional[str]:
+    """Pick the preferred subprotocol offered by the client, if any."""
+    offered = websocket.scope.get("subprotocols", [])
+    for subprotocol in SUPPORTED_SUBPROTOCOLS:
+        if subprotocol in offered:
+            return subprotocol
+    return None
+
+
+ServerMessage = Union[InferenceResult, InferenceError]
+
+
+async def _receive_frame(websocket: WebSocket) -> Union[bytes, str]:
     """
-    WebSocket endpoint for real-time chord inference.
+    Receive one frame as raw bytes or text.
     
-    Accepts InferenceRequest messages and returns InferenceResult
-    or InferenceError responses.
+    Reads the ASGI message directly instead of receive_json/receive_bytes,
+    so either frame type is accepted and nothing is decoded twice.
     """
-    await websocket.accept()
-    logger.info(f"WebSocket connection accepted from {websocket.client}")
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
     
-    try:
-        while True:
-            # Receive JSON message
+    data = message.get("bytes")
+    return data if data is not None else message["text"]
+
+
+def _message_to_dict(message: ServerMessage) -> Dict[str, Any]:
+    """Convert a server message to a dict, using the fast path for results."""
+    if isinstance(message, InferenceResult):
+        return result_to_dict(message)
+    return message.model_dump()
+
+
+async def _send_messages(
+    websocket: WebSocket,
+    messages: List[ServerMessage],
+    subprotocol: Optional[str],
+) -> None:
+    """
+    Serialize messages and send them as one frame in the negotiated format.
+    
+    A single message is sent as-is; several are coalesced into a batch
+    frame (a JSON array, or a binary batch frame).
+    """
+    if subprotocol == BINARY_FRAME_SUBPROTOCOL:
+        if len(messages) == 1:
+            await websocket.send_bytes(encode_message(messages[0]))
+        else:
+            await websocket.send_bytes(encode_batch(messages))
+        return
+    
+    if len(messages) == 1:
+        data = orjson.dumps(_message_to_dict(messages[0]))
+    else:
+        data = orjson.dumps([_message_to_dict(m) for m in messages])
+    
+    if subprotocol == JSON_BINARY_SUBPROTOCOL:
+        await websocket.send_bytes(data)
+    else:
+        await websocket.send_text(data.decode())
+
+
+def _put_latest(queue: asyncio.Queue, item) -> None:
+    """Queue an item without blocking, dropping the oldest one if full."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+async def _write_messages(
+    websocket: WebSocket,
+    outbound: "asyncio.Queue[ServerMessage]",
+    subprotocol: Optional[str],
+) -> None:
+    """Drain the outbound queue, coalescing messages that are ready together."""
+    while True:
+        batch = [await outbound.get()]
+        while not outbound.empty() and len(batch) < MAX_BATCH_SIZE:
+            batch.append(outbound.get_nowait())
+        await _send_messages(websocket, batch, subprotocol)
+
+
+async def _read_requests(
+    websocket: WebSocket,
+    inbound: "asyncio.Queue[InferenceRequest]",
+    outbound: "asyncio.Queue[ServerMessage]",
+    binary_frames: bool,
+) -> None:
+    """
+    Receive and parse frames into the inbound queue.
+    
+    Malformed messages are answered directly via the outbound queue. When
+    either queue is full its oldest entry is dropped, since only the latest
+    hand pose matters for a realtime chord feed.
+    """
+    while True:
+        # Receive a raw frame; a disconnect ends the session
+        raw = await _receive_frame(websocket)
+        binary_request = binary_frames and isinstance(raw, bytes)
+        
+        # Decode JSON (fixed-layout binary frames need no decoding); orjson
+        # plus model_validate is faster here than model_validate_json
+        if not binary_request:
             try:
-                data = await websocket.receive_json()
-            except Exception as e:
-                logger.warning(f"Failed to receive JSON: {e}")
-                await websocket.send_json(
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Failed to receive JSON: %r", e)
+                _put_latest(
+                    outbound,
                     InferenceError(
                         code="ERR_AI_400",
                         message=f"Invalid JSON format: {str(e)}",
-                    ).model_dump()
+                    )
                 )
                 continue
-            
-            # Validate request
-            try:
+        
+        # Validate request
+        try:
+            if binary_request and isinstance(raw, bytes):
+                request = decode_request(raw)
+            else:
                 request = InferenceRequest.model_validate(data)
-            except ValidationError as e:
-                error_msg = str(e.errors()[0]["msg"]) if e.errors() else str(e)
-                logger.warning(f"Validation error: {error_msg}")
-                await websocket.send_json(
-                    InferenceError(
-                        code="ERR_AI_400",
-                        message=f"Invalid request: {error_msg}",
-                    ).model_dump()
+        except ValueError as e:
+            if isinstance(e, ValidationError) and e.errors():
+                error_msg = str(e.errors()[0]["msg"])
+            else:
+                error_msg = str(e)
+            logger.warning("Validation error: %s", error_msg)
+            _put_latest(
+                outbound,
+                InferenceError(
+                    code="ERR_AI_400",
+                    message=f"Invalid request: {error_msg}",
                 )
-                continue
+            )
+            continue
+        
+        # Drop the stalest frame rather than stall the socket
+        _put_latest(inbound, request)
+
+
+async def _process_requests(
+    inbound: "asyncio.Queue[InferenceRequest]",
+    outbound: "asyncio.Queue[ServerMessage]",
+) -> None:
+    """Run inference on queued requests and queue the responses."""
+    loop = asyncio.get_running_loop()
+    
+    # Input buffer reused for every frame on this connection
+    scratch = np.empty(VECTOR_SIZE, dtype=np.float32)
+    
+    while True:
+        request = await inbound.get()
+        start_time = loop.time()
+        
+        try:
+            if not chord_service:
+                raise RuntimeError("Chord service not initialized")
             
-            # Process inference
-            start_time = time.time()
+            result = await chord_service.process_inference(request, scratch=scratch)
             
-            try:
-                if not chord_service:
-                    raise RuntimeError("Chord service not initialized")
-                
-                result = await chord_service.process_inference(request)
-                
-                # Log processing time
-                elapsed_ms = (time.time() - start_time) * 1000
+            # Log processing time (skip formatting unless debug is enabled)
+            if logger.isEnabledFor(logging.DEBUG):
+                elapsed_ms = (loop.time() - start_time) * 1000
                 logger.debug(
-                    f"Inference completed in {elapsed_ms:.1f}ms | "
-                    f"Chord: {result.chord_id} | Confidence: {result.confidence:.2f}"
+                    "Inference completed in %.1fms | Chord: %s | Confidence: %.2f",
+                    elapsed_ms,
+                    result.chord_id,
+                    result.confidence,
                 )
-                
-                # Send result
-                await websocket.send_json(result.model_dump())
-                
-            except Exception as e:
-                logger.error(f"Inference error: {e}")
-                await websocket.send_json(
-                    InferenceError(
-                        code="ERR_DEP_500",
-                        message=f"Inference failed: {str(e)}",
-                    ).model_dump()
+            
+            # Queue result for the writer task
+            _put_latest(outbound, result)
+            
+        except Exception as e:
+            logger.error("Inference error: %s", e)
+            _put_latest(
+                outbound,
+                InferenceError(
+                    code="ERR_DEP_500",
+                    message=f"Inference failed: {str(e)}",
                 )
+            )
+
+
+@app.websocket("/ws/inference")
+async def websocket_inference(websocket: WebSocket):
+    """
+    WebSocket endpoint for real-time chord inference.
+    
+    Accepts InferenceRequest messages and returns InferenceResult
+    or InferenceError responses. JSON text frames are the default;
+    see SUPPORTED_SUBPROTOCOLS for the binary formats.
+    
+    Each connection runs a reader, an inference worker and a writer task
+    so receiving the next frame is never blocked behind inference or
+    sending. If any of them fails the connection is closed with 1011.
+    """
+    subprotocol = _select_subprotocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    logger.info("WebSocket connection accepted from %s", websocket.client)
+    
+    inbound: "asyncio.Queue[InferenceRequest]" = asyncio.Queue(maxsize=INBOUND_QUEUE_SIZE)
+    outbound: "asyncio.Queue[ServerMessage]" = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+    
+    tasks = [
+        asyncio.create_task(_read_requests(
+            websocket, inbound, outbound, subprotocol == BINARY_FRAME_SUBPROTOCOL
+        )),
+        asyncio.create_task(_process_requests(inbound, outbound)),
+        asyncio.create_task(_write_messages(websocket, outbound, subprotocol)),
+    ]
+    
+    try:
+        # The tasks loop forever, so the first one to finish has failed:
+        # usually the reader on disconnect, but a crashed worker or writer
+        # must end the session too instead of leaving it silently stalled
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        next(iter(done)).result()
     
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected: {websocket.client}")
+        logger.info("WebSocket disconnected: %s", websocket.client)
     
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         try:
             await websocket.close(code=1011, reason=str(e))
         except:
             pass
+    
+    finally:
+        for task in tasks:
+            if task.done() and not task.cancelled():
+                task.exception()  # Mark any further failure as retrieved
+            task.cancel()
 
 
 # ==============================================
@@ -225,12 +403,30 @@ async def websocket_inference(websocket: WebSocket):
 # ==============================================
 
 if __name__ == "__main__":
+    import importlib.util
+    
     import uvicorn
     
+    # uvloop/httptools ship with uvicorn[standard] but uvloop is unavailable on Windows
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    
+    # Reload forces the default event loop, so it is opt-in for development
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    
+    # One event loop per worker process to scale past the GIL
+    workers = 1 if reload else int(os.getenv("WORKERS", "4"))
+    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=workers,
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        ws="websockets",
+        # Landmark frames are a few hundred bytes; compression only costs CPU
+        ws_per_message_deflate=False,
         log_level=LOG_LEVEL.lower(),
     )
@@ -7,8 +7,58 @@ Implements strict validation for inference requests and results.
 Author: AIAR Guitar Team
 """
 
-from typing import List, Literal, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, List, Literal, Optional, Dict, Any
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+    PlainSerializer,
+    WithJsonSchema,
+    field_validator,
+)
+
+VECTOR_LENGTH = 63  # 21 landmarks × 3 coordinates
+TIMESTAMP_LIMIT = 2 ** 64  # Timestamps must fit the binary protocol's u64 field
+
+
+def _vector_in_range(arr: np.ndarray) -> bool:
+    """Check all values are finite and within [-10, 10]."""
+    # min/max propagate NaN, so two reductions cover range and finiteness
+    lo, hi = float(arr.min()), float(arr.max())
+    return -10 <= lo and hi <= 10
+
+
+def _to_float32_vector(value: Any) -> np.ndarray:
+    """Coerce a landmark vector to a flat float32 array of VECTOR_LENGTH."""
+    if isinstance(value, (str, bytes)):
+        raise ValueError("Vector must be a list of numbers")
+    try:
+        arr = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        # Pydantic only wraps ValueError, so dicts and other objects must not leak TypeError
+        raise ValueError("Vector must be a list of numbers") from None
+    if arr.shape != (VECTOR_LENGTH,):
+        raise ValueError(
+            f"Invalid vector length: expected {VECTOR_LENGTH} floats, got shape {arr.shape}"
+        )
+    return arr
+
+
+# Parsed once into float32 so inference never re-converts a Python list;
+# serialized and documented as a plain array of numbers
+Float32Vector = Annotated[
+    np.ndarray,
+    BeforeValidator(_to_float32_vector),
+    PlainSerializer(lambda arr: arr.tolist(), return_type=List[float]),
+    WithJsonSchema({
+        "type": "array",
+        "items": {"type": "number"},
+        "minItems": VECTOR_LENGTH,
+        "maxItems": VECTOR_LENGTH,
+    }),
+]
 
 
 # ==============================================
@@ -23,15 +73,18 @@ class InferenceRequest(BaseModel):
     """
     
     type: Literal["inference_request"] = "inference_request"
-    timestamp: int = Field(..., description="Unix timestamp in milliseconds")
+    timestamp: int = Field(
+        ...,
+        ge=0,
+        lt=TIMESTAMP_LIMIT,
+        description="Unix timestamp in milliseconds",
+    )
     hand_anchor: Literal["left_wrist", "right_wrist", "body_center"] = Field(
         "left_wrist",
         description="Anchor point used for normalization",
     )
-    left_hand_vector: List[float] = Field(
+    left_hand_vector: Float32Vector = Field(
         ...,
-        min_length=63,
-        max_length=63,
         description="Flattened 21 landmarks × 3 coordinates = 63 floats",
     )
     mode: Optional[Literal["chord_correction"]] = Field(
@@ -45,16 +98,17 @@ class InferenceRequest(BaseModel):
     
     @field_validator("left_hand_vector")
     @classmethod
-    def validate_vector_values(cls, v: List[float]) -> List[float]:
-        """Validate that vector values are in reasonable range."""
-        for i, val in enumerate(v):
-            if not isinstance(val, (int, float)):
-                raise ValueError(f"Vector element {i} must be a number, got {type(val)}")
-            if val < -10 or val > 10:
-                raise ValueError(f"Vector element {i} out of range [-10, 10]: {val}")
+    def validate_vector_values(cls, v: np.ndarray) -> np.ndarray:
+        """Validate that vector values are finite and in reasonable range."""
+        # Already a float32 array; check it in one vectorized pass
+        if not _vector_in_range(v):
+            bad = ~np.isfinite(v) | (v < -10) | (v > 10)
+            i = int(np.argmax(bad))
+            raise ValueError(f"Vector element {i} out of range [-10, 10]: {v[i]}")
         return v
 
     class Config:
+        arbitrary_types_allowed = True
         json_schema_extra = {
             "example": {
                 "type": "inference_request",
@@ -77,7 +131,7 @@ class InferenceResult(BaseModel):
     """
     
     type: Literal["inference_result"] = "inference_result"
-    timestamp: int = Field(..., description="Unix timestamp")
+    timestamp: int = Field(..., description="Timestamp of the request this result answers")
     chord_id: str = Field(..., description="Recognized chord identifier (e.g., 'C_Major')")
     confidence: float = Field(
         ...,
@@ -115,6 +169,15 @@ class InferenceResult(BaseModel):
                 raise ValueError(f"Fingering element {i} out of range [-1, 24]: {fret}")
         return v
 
+    @field_validator("override_notes")
+    @classmethod
+    def validate_override_notes(cls, v: Optional[List[int]]) -> Optional[List[int]]:
+        """Validate override notes are MIDI note numbers."""
+        for i, note in enumerate(v or []):
+            if note < 0 or note > 127:
+                raise ValueError(f"Override note {i} out of MIDI range [0, 127]: {note}")
+        return v
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -202,3 +265,32 @@ class ChordMatch(BaseModel):
     score: float
     fingering: List[int]
     midi_notes: List[int]
+
+
+# ==============================================
+# Hot Path Codecs
+# ==============================================
+
+_RESULT_TEMPLATE: Dict[str, Any] = {
+    "type": "inference_result",
+    "timestamp": 0,
+    "chord_id": "",
+    "confidence": 0.0,
+    "fingering_map": None,
+    "correction_active": False,
+    "override_notes": None,
+    "message": None,
+}
+
+
+def result_to_dict(result: InferenceResult) -> Dict[str, Any]:
+    """Equivalent of result.model_dump() that fills a prebuilt template."""
+    payload = dict(_RESULT_TEMPLATE)
+    payload["timestamp"] = result.timestamp
+    payload["chord_id"] = result.chord_id
+    payload["confidence"] = result.confidence
+    payload["fingering_map"] = result.fingering_map
+    payload["correction_active"] = result.correction_active
+    payload["override_notes"] = result.override_notes
+    payload["message"] = result.message
+    return payload
@@ -0,0 +1,153 @@
+"""
+AIAR Guitar Backend - Binary WebSocket Protocol
+
+Fixed-layout binary frames for the ``aiar.frame.v1`` subprotocol.
+Avoids JSON text and field names entirely for the per-frame hot path.
+
+Request frame (260 bytes, little-endian):
+    u64      timestamp (ms)
+    f32[63]  left hand vector
+
+Result frame (29 bytes, little-endian):
+    u8       message type (0 = result)
+    u64      timestamp
+    u16      chord index into CHORD_ID_TABLE (0xFFFF = unknown)
+    f32      confidence
+    u8       flags (bit 0 = correction active, bit 1 = low confidence)
+    i8[6]    fingering map
+    u8       override note count
+    u8[6]    override MIDI notes (zero padded)
+
+Error frame (variable length):
+    u8       message type (1 = error)
+    u8       error code index into ERROR_CODE_TABLE
+    bytes    UTF-8 error message
+
+Batch frame (variable length):
+    u8       message type (2 = batch)
+    u16      message count
+    repeated u16 frame length + result or error frame
+
+Author: AIAR Guitar Team
+"""
+
+import struct
+from typing import List, Union, get_args
+
+import numpy as np
+
+from app.models.inference_models import (
+    InferenceRequest,
+    InferenceResult,
+    InferenceError,
+)
+from app.services.chord_recognition import (
+    CHORD_DATABASE,
+    LOW_CONFIDENCE_THRESHOLD,
+    VECTOR_SIZE,
+)
+
+# ==============================================
+# Frame Layout
+# ==============================================
+
+REQUEST_HEADER = struct.Struct("<Q")
+REQUEST_FRAME_SIZE = REQUEST_HEADER.size + VECTOR_SIZE * 4
+
+RESULT_FRAME = struct.Struct("<BQHfB6bB6B")
+ERROR_HEADER = struct.Struct("<BB")
+BATCH_HEADER = struct.Struct("<BH")
+BATCH_ENTRY_HEADER = struct.Struct("<H")
+
+MESSAGE_TYPE_RESULT = 0
+MESSAGE_TYPE_ERROR = 1
+MESSAGE_TYPE_BATCH = 2
+
+FLAG_CORRECTION_ACTIVE = 0x01
+FLAG_LOW_CONFIDENCE = 0x02
+
+UNKNOWN_CHORD_INDEX = 0xFFFF
+MAX_BATCH_SIZE = 0xFFFF  # Batch message count is a u16
+
+# Chord identifiers are interned by position; clients share this ordering
+CHORD_ID_TABLE = tuple(CHORD_DATABASE)
+CHORD_INDEX = {chord_id: i for i, chord_id in enumerate(CHORD_ID_TABLE)}
+
+ERROR_CODE_TABLE = get_args(InferenceError.model_fields["code"].annotation)
+ERROR_CODE_INDEX = {code: i for i, code in enumerate(ERROR_CODE_TABLE)}
+
+
+# ==============================================
+# Codec
+# ==============================================
+
+def decode_request(frame: bytes) -> InferenceRequest:
+    """Decode a binary request frame into a validated InferenceRequest."""
+    if len(frame) != REQUEST_FRAME_SIZE:
+        raise ValueError(
+            f"Invalid frame size: expected {REQUEST_FRAME_SIZE} bytes, got {len(frame)}"
+        )
+
+    (timestamp,) = REQUEST_HEADER.unpack_from(frame)
+    vector = np.frombuffer(
+        frame, dtype="<f4", count=VECTOR_SIZE, offset=REQUEST_HEADER.size
+    )
+
+    # The frame carries no anchor, mode or metadata
+    return InferenceRequest(
+        timestamp=timestamp,
+        hand_anchor="left_wrist",
+        left_hand_vector=vector,
+        mode=None,
+        meta=None,
+    )
+
+
+def encode_result(result: InferenceResult) -> bytes:
+    """Encode an InferenceResult as a fixed-size binary frame."""
+    flags = 0
+    if result.correction_active:
+        flags |= FLAG_CORRECTION_ACTIVE
+    if result.confidence < LOW_CONFIDENCE_THRESHOLD:
+        flags |= FLAG_LOW_CONFIDENCE
+
+    notes = (result.override_notes or [])[:6]
+    padded_notes = list(notes) + [0] * (6 - len(notes))
+
+    return RESULT_FRAME.pack(
+        MESSAGE_TYPE_RESULT,
+        result.timestamp,
+        CHORD_INDEX.get(result.chord_id, UNKNOWN_CHORD_INDEX),
+        result.confidence,
+        flags,
+        *result.fingering_map,
+        len(notes),
+        *padded_notes,
+    )
+
+
+def encode_error(error: InferenceError) -> bytes:
+    """Encode an InferenceError as a binary frame."""
+    return ERROR_HEADER.pack(
+        MESSAGE_TYPE_ERROR,
+        ERROR_CODE_INDEX[error.code],
+    ) + error.message.encode("utf-8")
+
+
+def encode_message(message: Union[InferenceResult, InferenceError]) -> bytes:
+    """Encode any server message as a binary frame."""
+    if isinstance(message, InferenceError):
+        return encode_error(message)
+    return encode_result(message)
+
+
+def encode_batch(messages: List[Union[InferenceResult, InferenceError]]) -> bytes:
+    """Encode several server messages into one length-prefixed batch frame."""
+    if len(messages) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch too large: {len(messages)} > {MAX_BATCH_SIZE} messages")
+    parts = [BATCH_HEADER.pack(MESSAGE_TYPE_BATCH, len(messages))]
+    for message in messages:
+        frame = encode_message(message)
+        parts.append(BATCH_ENTRY_HEADER.pack(len(frame)))
+        parts.append(frame)
+    return b"".join(parts)
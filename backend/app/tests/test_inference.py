@@ -8,23 +8,50 @@ Usage: pytest -v app/tests/
 
 import pytest
 import asyncio
+import functools
+from types import SimpleNamespace
 from typing import List
 
+import orjson
 from fastapi.testclient import TestClient
 from fastapi.websockets import WebSocket
 
-from app.main import app
+from app.main import (
+    app,
+    JSON_BINARY_SUBPROTOCOL,
+    BINARY_FRAME_SUBPROTOCOL,
+    _read_requests,
+    _write_messages,
+)
 from app.models.inference_models import (
     InferenceRequest,
     InferenceResult,
     InferenceError,
+    result_to_dict,
 )
 from app.services.chord_recognition import (
     ChordRecognitionService,
     l2_normalize,
     validate_normalization,
+    generate_mock_embeddings,
+    load_chord_bank,
     CHORD_DATABASE,
 )
+from app.services.binary_protocol import (
+    REQUEST_HEADER,
+    REQUEST_FRAME_SIZE,
+    RESULT_FRAME,
+    ERROR_HEADER,
+    BATCH_HEADER,
+    BATCH_ENTRY_HEADER,
+    MAX_BATCH_SIZE,
+    MESSAGE_TYPE_RESULT,
+    MESSAGE_TYPE_ERROR,
+    MESSAGE_TYPE_BATCH,
+    CHORD_ID_TABLE,
+    ERROR_CODE_TABLE,
+    encode_batch,
+)
 
 
 # ==============================================
@@ -32,8 +59,13 @@ from app.services.chord_recognition import (
 # ==============================================
 
 @pytest.fixture
-def client():
+def client(monkeypatch, tmp_path):
     """Create test client."""
+    # Keep the lifespan's chord bank cache out of the source tree
+    monkeypatch.setattr(
+        "app.main.ChordRecognitionService",
+        functools.partial(ChordRecognitionService, bank_path=str(tmp_path / "chord_bank.npy")),
+    )
     with TestClient(app) as client:
         yield client
 
@@ -44,6 +76,14 @@ def sample_vector() -> List[float]:
     return [0.1 * i for i in range(63)]
 
 
+@pytest.fixture(scope="session")
+def normalized_sample_vector():
+    """Normalized float32 sample vector, shared read-only across tests."""
+    vector = l2_normalize([0.1 * i for i in range(63)])
+    vector.flags.writeable = False  # Any in-place use by the code under test fails loudly
+    return vector
+
+
 @pytest.fixture
 def valid_request(sample_vector) -> dict:
     """Create a valid inference request."""
@@ -59,12 +99,58 @@ def valid_request(sample_vector) -> dict:
 @pytest.fixture
 async def chord_service():
     """Create and initialize chord service."""
-    service = ChordRecognitionService()
+    service = ChordRecognitionService(bank_path="")  # Don't write the chord bank cache
     await service.initialize()
     yield service
     await service.close()
 
 
+# ==============================================
+# Test Doubles
+# ==============================================
+
+class FakeWebSocket:
+    """Replays text frames to the reader, then disconnects; records sent text."""
+    
+    def __init__(self, frames=()):
+        self.frames = list(frames)
+        self.sent = []
+    
+    async def receive(self):
+        if not self.frames:
+            return {"type": "websocket.disconnect", "code": 1000}
+        return {"type": "websocket.receive", "text": self.frames.pop(0)}
+    
+    async def send_text(self, data):
+        self.sent.append(data)
+
+
+class FakeQdrantClient:
+    """AsyncQdrantClient stand-in that answers every query with one point."""
+    
+    def __init__(self, payload, score=0.9):
+        self.payload = payload
+        self.score = score
+        self.batch_sizes = []
+    
+    def _point(self, score):
+        return SimpleNamespace(score=score, payload=self.payload)
+    
+    async def query_points(self, collection_name, query, limit, search_params=None):
+        return SimpleNamespace(points=[self._point(self.score)])
+    
+    async def query_batch_points(self, collection_name, requests):
+        # Scores step by 0.1 per request so callers can tell responses apart
+        self.batch_sizes.append(len(requests))
+        return [
+            SimpleNamespace(points=[self._point(self.score + i / 10)])
+            for i in range(len(requests))
+        ]
+    
+    async def close(self):
+        pass
+
+
 # ==============================================
 # Health Check Tests
 # ==============================================
@@ -102,6 +188,8 @@ class TestInferenceModels:
     
     def test_valid_request(self, sample_vector):
         """Test that valid request passes validation."""
+        import numpy as np
+        
         request = InferenceRequest(
             type="inference_request",
             timestamp=1700000000,
@@ -110,7 +198,9 @@ class TestInferenceModels:
         )
         
         assert request.type == "inference_request"
-        assert len(request.left_hand_vector) == 63
+        assert request.left_hand_vector.shape == (63,)
+        assert request.left_hand_vector.dtype == np.float32
+        assert request.model_dump()["left_hand_vector"] == pytest.approx(sample_vector)
     
     def test_invalid_vector_length(self):
         """Test that wrong vector length fails validation."""
@@ -135,6 +225,32 @@ class TestInferenceModels:
                 left_hand_vector=bad_vector,
             )
     
+    def test_nan_vector_value(self, sample_vector):
+        """Test that NaN values fail validation."""
+        bad_vector = sample_vector.copy()
+        bad_vector[5] = float('nan')
+        
+        with pytest.raises(ValueError):
+            InferenceRequest(
+                type="inference_request",
+                timestamp=1700000000,
+                hand_anchor="left_wrist",
+                left_hand_vector=bad_vector,
+            )
+    
+    @pytest.mark.parametrize("timestamp", [-5, 2 ** 64])
+    def test_timestamp_out_of_range(self, sample_vector, timestamp):
+        """Test timestamps the binary protocol cannot encode fail validation."""
+        data = {
+            "type": "inference_request",
+            "timestamp": timestamp,
+            "hand_anchor": "left_wrist",
+            "left_hand_vector": sample_vector,
+        }
+        
+        with pytest.raises(ValueError):
+            InferenceRequest(**data)
+    
     def test_valid_result(self):
         """Test that valid result passes validation."""
         result = InferenceResult(
@@ -162,6 +278,34 @@ class TestInferenceModels:
                 correction_active=True,
             )
 
+    
+    @pytest.mark.parametrize("vector", [
+        [[0.1]] * 63,
+        [[[0.1, 0.2]]] * 63,
+        [[0.1]] * 62 + [[0.1, 0.2]],
+    ])
+    def test_nested_vectors_rejected(self, valid_request, vector):
+        """Test nested and ragged vectors fail validation."""
+        from pydantic import ValidationError
+        
+        bad_request = dict(valid_request, left_hand_vector=vector)
+        
+        with pytest.raises(ValidationError):
+            InferenceRequest.model_validate(bad_request)
+    
+    def test_result_to_dict_matches_model_dump(self):
+        """Test template-based result serialization matches model_dump."""
+        result = InferenceResult(
+            timestamp=1700000001,
+            chord_id="C_Major",
+            confidence=0.95,
+            fingering_map=[0, 3, 2, 0, 1, 0],
+            correction_active=True,
+            override_notes=[48, 52, 55, 60, 64, 67],
+        )
+        
+        assert result_to_dict(result) == result.model_dump()
+
 
 # ==============================================
 # Vector Processing Tests
@@ -177,9 +321,8 @@ class TestVectorProcessing:
         vector = [1.0, 2.0, 3.0]
         normalized = l2_normalize(vector)
         
-        # Check unit length
-        norm = np.linalg.norm(normalized)
-        assert abs(norm - 1.0) < 1e-6
+        # Check unit length (squared norm, no sqrt needed)
+        assert abs(float(normalized @ normalized) - 1.0) < 1e-6
     
     def test_l2_normalize_zero_vector(self):
         """Test L2 normalization handles zero vector."""
@@ -191,6 +334,18 @@ class TestVectorProcessing:
         # Should return zero vector
         assert np.all(normalized == 0)
     
+    def test_l2_normalize_into_buffer(self, sample_vector):
+        """Test L2 normalization can write in place."""
+        import numpy as np
+        
+        buffer = np.array(sample_vector, dtype=np.float32)
+        expected = l2_normalize(sample_vector)
+        
+        normalized = l2_normalize(buffer, out=buffer)
+        
+        assert normalized is buffer
+        assert np.allclose(normalized, expected)
+    
     def test_validate_normalization(self, sample_vector):
         """Test input validation cleans bad values."""
         import numpy as np
@@ -205,6 +360,20 @@ class TestVectorProcessing:
         assert cleaned[0] == 0.0
         # Inf should be replaced with 1
         assert cleaned[1] == 1.0
+    
+    def test_validate_normalization_into_buffer(self, sample_vector):
+        """Test input validation reuses a provided buffer."""
+        import numpy as np
+        
+        buffer = np.empty(63, dtype=np.float32)
+        bad_vector = sample_vector.copy()
+        bad_vector[0] = float('nan')
+        
+        cleaned = validate_normalization(bad_vector, out=buffer)
+        
+        assert cleaned is buffer
+        assert cleaned[0] == 0.0
+        assert np.allclose(cleaned[1:], sample_vector[1:])
 
 
 # ==============================================
@@ -220,18 +389,70 @@ class TestChordRecognition:
         assert chord_service.use_mock is True  # Mock mode without Qdrant
         assert len(chord_service.chord_embeddings) > 0
     
-    @pytest.mark.asyncio
-    async def test_mock_search_returns_results(self, chord_service, sample_vector):
+    def test_mock_search_returns_results(self, chord_service, normalized_sample_vector):
         """Test mock search returns chord matches."""
         import numpy as np
         
-        query = l2_normalize(sample_vector)
-        results = await chord_service._search_mock(query)
+        query = normalized_sample_vector
+        results = chord_service._search_mock(query)
         
         assert len(results) > 0
         assert results[0].chord_id in CHORD_DATABASE
         assert 0 <= results[0].score <= 1
     
+    def test_mock_search_matches_pairwise_similarity(self, chord_service, normalized_sample_vector):
+        """Test vectorized search agrees with per-chord cosine similarity."""
+        query = normalized_sample_vector
+        results = chord_service._search_mock(query, top_k=5)
+        
+        expected = sorted(
+            (
+                (chord_service._compute_similarity(query, emb), chord_id)
+                for chord_id, emb in chord_service.chord_embeddings.items()
+            ),
+            reverse=True,
+        )[:5]
+        
+        assert [r.chord_id for r in results] == [c for _, c in expected]
+        for result, (score, _) in zip(results, expected):
+            assert abs(result.score - score) < 1e-5
+    
+    def test_search_kernel_matches_numpy(self, chord_service, normalized_sample_vector):
+        """Test the active search kernel agrees with the NumPy reference."""
+        import numpy as np
+        from app.services.chord_recognition import top_k_scores, _top_k_scores_numpy
+        
+        query = normalized_sample_vector
+        scores, idx = top_k_scores(query, chord_service._embedding_matrix, 3)
+        ref_scores, ref_idx = _top_k_scores_numpy(query, chord_service._embedding_matrix, 3)
+        
+        assert list(idx) == list(ref_idx)
+        assert np.allclose(scores, ref_scores, atol=1e-5)
+    
+    def test_int8_search_matches_float_search(self, chord_service, normalized_sample_vector):
+        """Test int8 shortlisting with float32 rescoring finds the same matches."""
+        query = normalized_sample_vector
+        float_results = chord_service._search_mock(query)
+        
+        chord_service.search_precision = "int8"
+        int8_results = chord_service._search_mock(query)
+        
+        assert [r.chord_id for r in int8_results] == [r.chord_id for r in float_results]
+        for int8_result, float_result in zip(int8_results, float_results):
+            assert abs(int8_result.score - float_result.score) < 1e-5
+    
+    def test_quantize_int8_per_row_scales(self, chord_service):
+        """Test per-row int8 quantization uses the full range and round-trips."""
+        import numpy as np
+        from app.services.chord_recognition import quantize_int8
+        
+        matrix = chord_service._embedding_matrix
+        quantized, scales = quantize_int8(matrix)
+        
+        assert quantized.dtype == np.int8
+        assert np.all(np.abs(quantized).max(axis=1) == 127)
+        assert np.allclose(quantized / scales[:, None], matrix, atol=0.5 / scales.min())
+    
     @pytest.mark.asyncio
     async def test_process_inference(self, chord_service, sample_vector):
         """Test full inference pipeline."""
@@ -248,6 +469,96 @@ class TestChordRecognition:
         assert result.chord_id is not None
         assert 0 <= result.confidence <= 1
         assert len(result.fingering_map) == 6
+        assert result.timestamp == request.timestamp
+    
+    @pytest.mark.asyncio
+    async def test_process_inference_reuses_cached_result(self, chord_service, sample_vector):
+        """Test near-identical frames are served from the result cache."""
+        request = InferenceRequest(
+            timestamp=1700000000,
+            left_hand_vector=sample_vector,
+        )
+        jittered = InferenceRequest(
+            timestamp=1700000001,
+            left_hand_vector=[v + 1e-4 for v in sample_vector],
+        )
+        
+        first = await chord_service.process_inference(request)
+        second = await chord_service.process_inference(jittered)
+        
+        assert len(chord_service._result_cache) == 1
+        assert second.timestamp == jittered.timestamp
+        assert second.chord_id == first.chord_id
+        assert second.confidence == first.confidence
+    
+    @pytest.mark.asyncio
+    async def test_qdrant_search_awaits_async_client(self, chord_service, normalized_sample_vector):
+        """Test Qdrant search awaits the async client and maps payloads."""
+        chord_service.qdrant_client = FakeQdrantClient({
+            "chord_id": "C_Major",
+            "fingering": CHORD_DATABASE["C_Major"]["fingering"],
+            "midi_notes": CHORD_DATABASE["C_Major"]["midi_notes"],
+        })
+        results = await chord_service._search_qdrant(normalized_sample_vector)
+        chord_service.qdrant_client = None
+        
+        assert len(results) == 1
+        assert results[0].chord_id == "C_Major"
+        assert results[0].score == 0.9
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("payload", [
+        {"chord_id": "C_Major", "fingering": [99] * 6},
+        {"chord_id": "C_Major", "fingering": [0, 3]},
+        {"chord_id": "C_Major", "fingering": [0, 3, 2, 0, 1, 0], "midi_notes": [300]},
+    ])
+    async def test_process_inference_validates_qdrant_payload(self, chord_service, sample_vector, payload):
+        """Test malformed Qdrant payloads fail validation instead of reaching the encoders."""
+        chord_service.qdrant_client = FakeQdrantClient(payload, score=0.99)
+        chord_service.use_mock = False
+        request = InferenceRequest(timestamp=1700000000, left_hand_vector=sample_vector)
+        
+        with pytest.raises(ValueError):
+            await chord_service.process_inference(request)
+        
+        chord_service.qdrant_client = None
+        chord_service.use_mock = True
+        assert not chord_service._result_cache
+    
+    @pytest.mark.asyncio
+    async def test_qdrant_batcher_coalesces_concurrent_searches(self, chord_service, normalized_sample_vector):
+        """Test concurrent Qdrant searches share one query_batch_points call."""
+        fake_client = FakeQdrantClient(
+            {"chord_id": "C_Major", "fingering": [0, 3, 2, 0, 1, 0]}, score=0.5
+        )
+        chord_service.qdrant_client = fake_client
+        chord_service._start_qdrant_batcher()
+        
+        results = await asyncio.gather(*(
+            chord_service._search_qdrant(normalized_sample_vector) for _ in range(3)
+        ))
+        await chord_service.close()
+        
+        assert fake_client.batch_sizes == [3]
+        assert [r[0].score for r in results] == [0.5, 0.6, 0.7]
+    
+    def test_chord_bank_cache_round_trip(self, tmp_path):
+        """Test the chord bank is written once and then memory-mapped back."""
+        import numpy as np
+        
+        path = str(tmp_path / "chord_bank.npy")
+        chord_ids = list(CHORD_DATABASE)
+        
+        built = load_chord_bank(path, chord_ids)
+        loaded = load_chord_bank(path, chord_ids)
+        
+        assert np.array_equal(built, generate_mock_embeddings(chord_ids))
+        assert np.array_equal(loaded, built)
+        assert not loaded.flags.writeable  # Served from the read-only mapping
+        
+        # A different chord order invalidates the cache
+        rebuilt = load_chord_bank(path, chord_ids[::-1])
+        assert np.array_equal(rebuilt, built[::-1])
     
     def test_chord_database_complete(self):
         """Test chord database has required fields."""
@@ -255,6 +566,19 @@ class TestChordRecognition:
             assert "fingering" in data
             assert "midi_notes" in data
             assert len(data["fingering"]) == 6
+    
+    def test_chord_arrays_match_database(self):
+        """Test the structure-of-arrays view mirrors the chord database."""
+        from app.services.chord_recognition import (
+            _CHORD_IDS,
+            _FINGERINGS,
+            _MIDI_NOTES,
+        )
+        
+        for i, chord_id in enumerate(_CHORD_IDS):
+            data = CHORD_DATABASE[chord_id]
+            assert _FINGERINGS[i].tolist() == data["fingering"]
+            assert _MIDI_NOTES[i].tolist() == data["midi_notes"]
 
 
 # ==============================================
@@ -281,6 +605,20 @@ class TestWebSocket:
             assert response["type"] == "inference_error"
             assert response["code"] == "ERR_AI_400"
     
+    @pytest.mark.parametrize("vector", [{"a": 1}, [{}] * 63])
+    def test_websocket_non_numeric_vector(self, client, valid_request, vector):
+        """Test non-numeric vectors get an error reply and keep the socket open."""
+        with client.websocket_connect("/ws/inference") as websocket:
+            websocket.send_json(dict(valid_request, left_hand_vector=vector))
+            response = websocket.receive_json()
+            
+            assert response["type"] == "inference_error"
+            assert response["code"] == "ERR_AI_400"
+            
+            # Connection is still usable
+            websocket.send_json(valid_request)
+            assert websocket.receive_json()["type"] == "inference_result"
+    
     def test_websocket_valid_request(self, client, valid_request):
         """Test WebSocket handles valid request."""
         with client.websocket_connect("/ws/inference") as websocket:
@@ -292,6 +630,162 @@ class TestWebSocket:
             assert response["type"] == "inference_result"
             assert "chord_id" in response
             assert "confidence" in response
+    
+    def test_websocket_binary_json(self, client, valid_request):
+        """Test WebSocket exchanges JSON in binary frames when negotiated."""
+        with client.websocket_connect(
+            "/ws/inference", subprotocols=[JSON_BINARY_SUBPROTOCOL]
+        ) as websocket:
+            websocket.send_bytes(orjson.dumps(valid_request))
+            
+            response = orjson.loads(websocket.receive_bytes())
+            
+            assert response["type"] == "inference_result"
+            assert "chord_id" in response
+    
+    def test_websocket_binary_frame(self, client, sample_vector):
+        """Test WebSocket handles fixed-layout binary frames."""
+        import numpy as np
+        
+        frame = REQUEST_HEADER.pack(1700000000) + np.asarray(
+            sample_vector, dtype="<f4"
+        ).tobytes()
+        
+        with client.websocket_connect(
+            "/ws/inference", subprotocols=[BINARY_FRAME_SUBPROTOCOL]
+        ) as websocket:
+            websocket.send_bytes(frame)
+            
+            fields = RESULT_FRAME.unpack(websocket.receive_bytes())
+            
+            assert fields[0] == MESSAGE_TYPE_RESULT
+            assert CHORD_ID_TABLE[fields[2]] in CHORD_DATABASE
+            assert 0 <= fields[3] <= 1
+    
+    def test_websocket_binary_frame_accepts_json_text(self, client, valid_request):
+        """Test binary-frame clients may still send JSON text frames."""
+        with client.websocket_connect(
+            "/ws/inference", subprotocols=[BINARY_FRAME_SUBPROTOCOL]
+        ) as websocket:
+            websocket.send_json(valid_request)
+            
+            fields = RESULT_FRAME.unpack(websocket.receive_bytes())
+            
+            assert fields[0] == MESSAGE_TYPE_RESULT
+    
+    def test_websocket_binary_frame_rejects_negative_timestamp(self, client, valid_request):
+        """Test unencodable timestamps get an error frame instead of killing the writer."""
+        with client.websocket_connect(
+            "/ws/inference", subprotocols=[BINARY_FRAME_SUBPROTOCOL]
+        ) as websocket:
+            websocket.send_json(dict(valid_request, timestamp=-5))
+            
+            message_type, code_index = ERROR_HEADER.unpack_from(websocket.receive_bytes())
+            assert message_type == MESSAGE_TYPE_ERROR
+            assert ERROR_CODE_TABLE[code_index] == "ERR_AI_400"
+            
+            # Writer is still running
+            websocket.send_json(valid_request)
+            fields = RESULT_FRAME.unpack(websocket.receive_bytes())
+            assert fields[0] == MESSAGE_TYPE_RESULT
+    
+    def test_websocket_binary_frame_invalid_size(self, client):
+        """Test WebSocket rejects truncated binary frames."""
+        with client.websocket_connect(
+            "/ws/inference", subprotocols=[BINARY_FRAME_SUBPROTOCOL]
+        ) as websocket:
+            websocket.send_bytes(b"\x00" * 16)
+            
+            response = websocket.receive_bytes()
+            message_type, code_index = ERROR_HEADER.unpack_from(response)
+            
+            assert message_type == MESSAGE_TYPE_ERROR
+            assert ERROR_CODE_TABLE[code_index] == "ERR_AI_400"
+
+    
+    @pytest.mark.asyncio
+    async def test_writer_coalesces_pending_messages(self):
+        """Test messages queued together leave as one JSON array frame."""
+        websocket = FakeWebSocket()
+        outbound = asyncio.Queue()
+        for i in range(3):
+            outbound.put_nowait(InferenceError(code="ERR_AI_400", message=str(i)))
+        
+        writer = asyncio.create_task(_write_messages(websocket, outbound, None))
+        await asyncio.sleep(0)
+        writer.cancel()
+        
+        assert len(websocket.sent) == 1
+        batch = orjson.loads(websocket.sent[0])
+        assert [m["message"] for m in batch] == ["0", "1", "2"]
+    
+    @pytest.mark.asyncio
+    async def test_reader_drops_oldest_request_when_full(self, valid_request):
+        """Test the reader keeps only the latest requests under backpressure."""
+        from fastapi import WebSocketDisconnect
+        
+        frames = [
+            orjson.dumps(dict(valid_request, timestamp=i)).decode() for i in range(6)
+        ]
+        inbound = asyncio.Queue(maxsize=4)
+        outbound = asyncio.Queue()
+        
+        with pytest.raises(WebSocketDisconnect):
+            await _read_requests(FakeWebSocket(frames), inbound, outbound, False)
+        
+        timestamps = [inbound.get_nowait().timestamp for _ in range(inbound.qsize())]
+        assert timestamps == [2, 3, 4, 5]
+        assert outbound.empty()
+    
+    @pytest.mark.asyncio
+    async def test_reader_drops_oldest_response_when_full(self):
+        """Test a slow writer cannot back up the pipeline behind the outbound queue."""
+        from fastapi import WebSocketDisconnect
+        
+        inbound = asyncio.Queue(maxsize=4)
+        outbound = asyncio.Queue(maxsize=2)
+        
+        with pytest.raises(WebSocketDisconnect):
+            await _read_requests(FakeWebSocket(["x", "[x", "[1,x"]), inbound, outbound, False)
+        
+        # Error replies for the second and third frames survive
+        messages = [outbound.get_nowait().message for _ in range(outbound.qsize())]
+        assert len(messages) == 2
+        assert "(char 1)" in messages[0]
+        assert "(char 3)" in messages[1]
+    
+    def test_binary_frame_sizes(self):
+        """Test the fixed frame layouts match the documented sizes."""
+        assert REQUEST_FRAME_SIZE == 260
+        assert RESULT_FRAME.size == 29
+    
+    def test_encode_binary_batch(self):
+        """Test binary batch frames are count- and length-prefixed."""
+        errors = [
+            InferenceError(code="ERR_AI_400", message="first"),
+            InferenceError(code="ERR_DEP_500", message="second"),
+        ]
+        
+        frame = encode_batch(errors)
+        message_type, count = BATCH_HEADER.unpack_from(frame)
+        offset = BATCH_HEADER.size
+        messages = []
+        for _ in range(count):
+            (length,) = BATCH_ENTRY_HEADER.unpack_from(frame, offset)
+            offset += BATCH_ENTRY_HEADER.size
+            messages.append(frame[offset + ERROR_HEADER.size:offset + length].decode())
+            offset += length
+        
+        assert message_type == MESSAGE_TYPE_BATCH
+        assert messages == ["first", "second"]
+        assert offset == len(frame)
+    
+    def test_encode_binary_batch_too_large(self):
+        """Test batches beyond the u16 message count are rejected."""
+        error = InferenceError(code="ERR_AI_400", message="overflow")
+        
+        with pytest.raises(ValueError):
+            encode_batch([error] * (MAX_BATCH_SIZE + 1))
 
 
 # ==============================================
@@ -301,11 +795,11 @@ class TestWebSocket:
 class TestMathUtilities:
     """Tests for math utility functions."""
     
-    def test_similarity_same_vector(self, chord_service, sample_vector):
+    def test_similarity_same_vector(self, chord_service, normalized_sample_vector):
         """Test similarity of identical vectors is 1."""
         import numpy as np
         
-        vec = l2_normalize(sample_vector)
+        vec = normalized_sample_vector
         sim = chord_service._compute_similarity(vec, vec)
         
         assert abs(sim - 1.0) < 1e-6
@@ -320,3 +814,12 @@ class TestMathUtilities:
         sim = chord_service._compute_similarity(vec_a, vec_b)
         
         assert abs(sim) < 1e-6
+    
+    def test_similarity_zero_vector(self, chord_service, normalized_sample_vector):
+        """Test a zero vector scores 0, with or without SimSIMD."""
+        import numpy as np
+        
+        zero = np.zeros(63, dtype=np.float32)
+        
+        assert chord_service._compute_similarity(zero, zero) == 0.0
+        assert chord_service._compute_similarity(normalized_sample_vector, zero) == 0.0
@@ -69,19 +69,24 @@ export function useWebSocket() {
 
             ws.onmessage = (event) => {
                 try {
-                    const data = JSON.parse(event.data);
-
-                    if (data.type === 'inference_result') {
-                        const result = data as InferenceResult;
-                        setLastInferenceResult(result);
-                        setCurrentChord(result.chord_id as ChordId);
-                        setCorrectionActive(result.correction_active);
-                        if (result.override_notes) {
-                            setOverrideNotes(result.override_notes);
+                    const parsed = JSON.parse(event.data);
+
+                    // Bursts of responses arrive batched as a JSON array
+                    const messages = Array.isArray(parsed) ? parsed : [parsed];
+
+                    for (const data of messages) {
+                        if (data.type === 'inference_result') {
+                            const result = data as InferenceResult;
+                            setLastInferenceResult(result);
+                            setCurrentChord(result.chord_id as ChordId);
+                            setCorrectionActive(result.correction_active);
+                            if (result.override_notes) {
+                                setOverrideNotes(result.override_notes);
+                            }
+                        } else if (data.type === 'inference_error') {
+                            const error = data as InferenceError;
+                            console.warn('[WebSocket] Inference error:', error.message);
                         }
-                    } else if (data.type === 'inference_error') {
-                        const error = data as InferenceError;
-                        console.warn('[WebSocket] Inference error:', error.message);
                     }
                 } catch (e) {
                     console.error('[WebSocket] Failed to parse message:', e);
@@ -99,6 +99,20 @@ export type ChordId =
     | 'B_Major' | 'B_Minor' | 'B_7'
     | 'unknown';
 
+/**
+ * Chord identifiers by index, as interned by the `aiar.frame.v1`
+ * binary WebSocket protocol. Must match the backend CHORD_ID_TABLE.
+ */
+export const BINARY_CHORD_ID_TABLE: readonly ChordId[] = [
+    'C_Major', 'C_Minor',
+    'D_Major', 'D_Minor',
+    'E_Major', 'E_Minor',
+    'F_Major',
+    'G_Major', 'G_Minor',
+    'A_Major', 'A_Minor',
+    'B_Major', 'B_Minor',
+];
+
 /**
  * Chord data with fingering information
  */